@@ -8,8 +8,10 @@ This script initializes and runs the microphone monitor application.
 import argparse
 import sys
 
+from mic_level_monitor.audio.microphone import MicrophoneManager
 from mic_level_monitor.config.config_manager import ConfigManager
 from mic_level_monitor.monitoring.processor import MicrophoneMonitor
+from mic_level_monitor.ui.layout import MonitorUI
 
 
 def parse_arguments():
@@ -39,6 +41,13 @@ def parse_arguments():
     return parser.parse_args()
 
 
+def list_devices_only():
+    """List audio input devices without setting up MQTT or monitoring."""
+    config = ConfigManager.load_config()
+    devices = MicrophoneManager(config).list_input_devices()
+    MonitorUI(config).print_input_devices(devices)
+
+
 def main():
     """Main function."""
     args = parse_arguments()
@@ -57,6 +66,11 @@ def main():
     if args.config:
         ConfigManager.USER_CONFIG_FILE = args.config
 
+    # Just list devices if requested
+    if args.list_devices:
+        list_devices_only()
+        return 0
+
     # Create custom config from arguments
     config = {}
     if args.broker or args.port:
@@ -72,11 +86,6 @@ def main():
     # Initialize monitor
     monitor = MicrophoneMonitor(config)
 
-    # Just list devices if requested
-    if args.list_devices:
-        monitor.print_input_devices()
-        return 0
-
     # Setup and start monitoring
     monitor.setup_microphones(args.left_mic, args.right_mic)
     monitor.start_monitoring()
@@ -3,31 +3,102 @@
 Audio processing and microphone management for the microphone monitor.
 """
 
+import math
+import threading
+import time
+
 import numpy as np
 import pyaudio
 from typing import Dict, List, Optional, Tuple
 
 
+# NumPy sample types for the pyaudio formats the level meter understands
+_PA_TO_NP = {
+    pyaudio.paInt8: np.int8,
+    pyaudio.paInt16: np.int16,
+    pyaudio.paInt32: np.int32,
+    pyaudio.paFloat32: np.float32,
+}
+
+
+def _rms(samples: np.ndarray, scratch: np.ndarray) -> float:
+    """Return the RMS amplitude of the samples as a single dot product."""
+    # An empty buffer is silence, not 0/0 (nan would stick in the UI and
+    # produce invalid JSON payloads)
+    if samples.size == 0:
+        return 0.0
+
+    # Reuse the caller's float buffer instead of allocating a converted copy
+    values = scratch[: samples.size]
+    np.copyto(values, samples)
+    return math.sqrt(np.dot(values, values) / samples.size)
+
+
 class MicrophoneManager:
     """Manages audio devices and streams."""
 
+    # Reopening a dead stream is retried with a delay doubling up to this
+    _MAX_RETRY_DELAY = 30.0
+
     def __init__(self, config: Dict):
         """Initialize the microphone manager with configuration."""
         self.config = config
-        self.p = pyaudio.PyAudio()
+        # PortAudio is initialized on first use, see the p property
+        self._p = None
+        self._device_cache = None
+        self._name_cache: Dict[int, str] = {}
         self.left_mic_index = None
         self.right_mic_index = None
         self.left_stream = None
         self.right_stream = None
+        self.error_message = ""
+
+        # Latest levels, written by the PyAudio callback threads
+        self.left_level = 0.0
+        self.right_level = 0.0
+        self._levels_ready = threading.Event()
+
+        # Monotonic time of each stream's last callback, to tell when only
+        # one of them has stopped
+        self._left_seen = 0.0
+        self._right_seen = 0.0
+
+        # A stream whose callback has not run for this many seconds is
+        # considered dead, its level reads as 0.0 until it is reopened. Set
+        # from the buffer period when the streams are opened.
+        self.stream_timeout = 1.0
+
+        # Earliest monotonic time, and current delay, of the next attempt to
+        # reopen each stream
+        self._left_retry_at = 0.0
+        self._right_retry_at = 0.0
+        self._left_retry_delay = 0.0
+        self._right_retry_delay = 0.0
+
+        # Per-stream scratch buffers, the callbacks run on separate threads
+        self._left_scratch = None
+        self._right_scratch = None
+        self._np_dtype = np.int16
 
     def __del__(self):
         """Clean up resources when object is deleted."""
         self.close_streams()
-        if hasattr(self, "p") and self.p:
-            self.p.terminate()
+        if getattr(self, "_p", None):
+            self._p.terminate()
+
+    @property
+    def p(self) -> pyaudio.PyAudio:
+        """The PyAudio instance, created lazily since initialization is slow."""
+        if self._p is None:
+            self._p = pyaudio.PyAudio()
+        return self._p
 
     def list_input_devices(self) -> List[Dict]:
         """List all available audio input devices."""
+        # Devices are enumerated once per process
+        if self._device_cache is not None:
+            return list(self._device_cache)
+
         input_devices = []
 
         for i in range(self.p.get_device_count()):
@@ -42,7 +113,8 @@ class MicrophoneManager:
                     }
                 )
 
-        return input_devices
+        self._device_cache = input_devices
+        return list(input_devices)
 
     def set_microphone_indices(self, left_index: int, right_index: int) -> None:
         """Set the microphone indices for left and right channels."""
@@ -51,11 +123,18 @@ class MicrophoneManager:
 
     def get_device_name(self, index: int) -> str:
         """Get the name of a device by index."""
+        name = self._name_cache.get(index)
+        if name is not None:
+            return name
+
         try:
-            return self.p.get_device_info_by_index(index)["name"]
+            name = self.p.get_device_info_by_index(index)["name"]
         except Exception:
             return "Unknown Device"
 
+        self._name_cache[index] = name
+        return name
+
     def open_streams(self) -> bool:
         """Open audio streams for both microphones."""
         if self.left_mic_index is None or self.right_mic_index is None:
@@ -64,68 +143,201 @@ class MicrophoneManager:
         try:
             audio_config = self.config["audio"]
 
-            self.left_stream = self.p.open(
-                format=audio_config["sample_format"],
-                channels=audio_config["channels"],
-                rate=audio_config["rate"],
-                input=True,
-                input_device_index=self.left_mic_index,
-                frames_per_buffer=audio_config["chunk_size"],
+            # Resolve the sample type once, the callbacks only use the result
+            self._np_dtype = _PA_TO_NP.get(audio_config["sample_format"])
+            if self._np_dtype is None:
+                raise ValueError(
+                    f"Unsupported sample format: {audio_config['sample_format']}"
+                )
+
+            # Allow a few missed buffers before calling a stream dead, large
+            # chunk sizes deliver a buffer only every second or more
+            self.stream_timeout = max(
+                1.0, 3 * audio_config["chunk_size"] / audio_config["rate"]
             )
 
-            self.right_stream = self.p.open(
-                format=audio_config["sample_format"],
-                channels=audio_config["channels"],
-                rate=audio_config["rate"],
-                input=True,
-                input_device_index=self.right_mic_index,
-                frames_per_buffer=audio_config["chunk_size"],
+            samples = audio_config["chunk_size"] * audio_config["channels"]
+            self._left_scratch = np.empty(samples, dtype=np.float64)
+            self._right_scratch = np.empty(samples, dtype=np.float64)
+
+            self.left_stream = self._open_stream(
+                self.left_mic_index, self._left_callback
+            )
+            self.right_stream = self._open_stream(
+                self.right_mic_index, self._right_callback
             )
 
+            # Levels of the previous streams are stale, start both from silence
+            self.left_level = 0.0
+            self.right_level = 0.0
+            self._left_seen = self._right_seen = time.monotonic()
+            self._left_retry_delay = self._right_retry_delay = 0.0
+
+            # Start capturing on both devices together, each stream is then
+            # serviced concurrently by its own PortAudio callback thread
+            self.left_stream.start_stream()
+            self.right_stream.start_stream()
+
+            self.error_message = ""
             return True
         except Exception as e:
-            print(f"Error opening audio streams: {e}")
+            # Not printed, this also runs on the monitoring thread while the
+            # live display owns the terminal
+            self.error_message = f"Error opening audio streams: {e}"
             self.close_streams()
             return False
 
+    def _open_stream(self, device_index: int, callback):
+        """Open a stopped callback stream on an input device."""
+        audio_config = self.config["audio"]
+        return self.p.open(
+            format=audio_config["sample_format"],
+            channels=audio_config["channels"],
+            rate=audio_config["rate"],
+            input=True,
+            input_device_index=device_index,
+            frames_per_buffer=audio_config["chunk_size"],
+            stream_callback=callback,
+            start=False,
+        )
+
+    def _reopen_stream(self, stream, device_index: int, callback):
+        """Close a dead stream and start a new one on the same device.
+
+        Returns the new stream, or None if the device could not be opened.
+        """
+        self._close_stream(stream)
+        new_stream = None
+        try:
+            new_stream = self._open_stream(device_index, callback)
+            new_stream.start_stream()
+            return new_stream
+        except Exception as e:
+            self.error_message = f"Error opening audio stream {device_index}: {e}"
+            self._close_stream(new_stream)
+            return None
+
+    def _next_retry_delay(self, delay: float) -> float:
+        """Return the delay before the next reopen attempt after a failure."""
+        return min(max(delay * 2, self.stream_timeout), self._MAX_RETRY_DELAY)
+
+    def _stream_alive(self, stream, last_seen: float, now: float) -> bool:
+        """Return True if a stream is running and delivering audio."""
+        if stream is None or now - last_seen >= self.stream_timeout:
+            return False
+        try:
+            return stream.is_active()
+        except Exception:
+            return False
+
+    def ensure_streams_active(self) -> bool:
+        """Reopen whichever audio stream has stopped.
+
+        Each stream is supervised on its own, a healthy stream keeps running
+        while the other one is reopened. Failed reopen attempts are retried
+        with a growing delay. Returns True if both streams are running.
+        """
+        now = time.monotonic()
+        left_ok = self._stream_alive(self.left_stream, self._left_seen, now)
+        right_ok = self._stream_alive(self.right_stream, self._right_seen, now)
+
+        if not left_ok and now >= self._left_retry_at:
+            self.left_stream = self._reopen_stream(
+                self.left_stream, self.left_mic_index, self._left_callback
+            )
+            left_ok = self.left_stream is not None
+            if left_ok:
+                self.left_level = 0.0
+                self._left_seen = now
+                self._left_retry_delay = 0.0
+            else:
+                self._left_retry_delay = self._next_retry_delay(
+                    self._left_retry_delay
+                )
+                self._left_retry_at = now + self._left_retry_delay
+
+        if not right_ok and now >= self._right_retry_at:
+            self.right_stream = self._reopen_stream(
+                self.right_stream, self.right_mic_index, self._right_callback
+            )
+            right_ok = self.right_stream is not None
+            if right_ok:
+                self.right_level = 0.0
+                self._right_seen = now
+                self._right_retry_delay = 0.0
+            else:
+                self._right_retry_delay = self._next_retry_delay(
+                    self._right_retry_delay
+                )
+                self._right_retry_at = now + self._right_retry_delay
+
+        return left_ok and right_ok
+
+    @staticmethod
+    def _close_stream(stream) -> None:
+        """Stop and close a stream, ignoring errors from dead devices."""
+        if stream is None:
+            return
+        try:
+            stream.stop_stream()
+            stream.close()
+        except Exception:
+            pass
+
     def close_streams(self) -> None:
         """Close audio streams."""
         if hasattr(self, "left_stream") and self.left_stream:
-            try:
-                self.left_stream.stop_stream()
-                self.left_stream.close()
-            except Exception:
-                pass
+            self._close_stream(self.left_stream)
             self.left_stream = None
 
         if hasattr(self, "right_stream") and self.right_stream:
-            try:
-                self.right_stream.stop_stream()
-                self.right_stream.close()
-            except Exception:
-                pass
+            self._close_stream(self.right_stream)
             self.right_stream = None
 
-    def read_mic_level(self, stream) -> float:
-        """Read the audio level from a microphone stream."""
+    def calculate_level(self, in_data: bytes, scratch: np.ndarray) -> float:
+        """Calculate the audio level of a raw audio buffer."""
         try:
-            audio_data = np.frombuffer(
-                stream.read(
-                    self.config["audio"]["chunk_size"], exception_on_overflow=False
-                ),
-                dtype=np.int16,
-            )
-            # Calculate volume level (absolute mean)
-            level = np.abs(audio_data).mean()
-            return level
-        except Exception as e:
-            print(f"Error reading microphone data: {e}")
+            audio_data = np.frombuffer(in_data, dtype=self._np_dtype)
+            # Calculate volume level (RMS)
+            return _rms(audio_data, scratch)
+        except Exception:
+            # An exception would abort the stream, report silence instead
             return 0.0
 
+    def _left_callback(self, in_data, frame_count, time_info, status):
+        """PyAudio callback storing the latest level of the left microphone."""
+        self.left_level = self.calculate_level(in_data, self._left_scratch)
+        self._left_seen = time.monotonic()
+        self._levels_ready.set()
+        return (None, pyaudio.paContinue)
+
+    def _right_callback(self, in_data, frame_count, time_info, status):
+        """PyAudio callback storing the latest level of the right microphone."""
+        self.right_level = self.calculate_level(in_data, self._right_scratch)
+        self._right_seen = time.monotonic()
+        self._levels_ready.set()
+        return (None, pyaudio.paContinue)
+
+    def wait_for_levels(self, timeout: Optional[float] = None) -> bool:
+        """Block until a stream callback delivers a new level or timeout expires."""
+        if not self._levels_ready.wait(timeout):
+            return False
+        self._levels_ready.clear()
+        return True
+
     def read_levels(self) -> Tuple[float, float]:
-        """Read levels from both microphones."""
-        left_level = self.read_mic_level(self.left_stream) if self.left_stream else 0.0
+        """Return the most recent levels of both microphones without blocking.
+
+        A stream that is closed or has stopped delivering audio reads as 0.0,
+        so a dead microphone never keeps reporting its last level.
+        """
+        cutoff = time.monotonic() - self.stream_timeout
+        left_level = (
+            self.left_level if self.left_stream and self._left_seen > cutoff else 0.0
+        )
         right_level = (
-            self.read_mic_level(self.right_stream) if self.right_stream else 0.0
+            self.right_level
+            if self.right_stream and self._right_seen > cutoff
+            else 0.0
         )
         return left_level, right_level
@@ -3,11 +3,33 @@
 Configuration Manager for Mic Level Monitor.
 """
 
+import copy
 import os
+import tomllib
+
 import toml
-import pyaudio
 from typing import Dict
 
+# PortAudio sample format constants (pyaudio.paFloat32, ...), kept as plain
+# values so loading the config does not require pyaudio
+_PA_FLOAT32 = 1
+_PA_INT32 = 2
+_PA_INT24 = 4
+_PA_INT16 = 8
+_PA_INT8 = 16
+
+# Sample format codes stored in the config files, mapped to pyaudio constants
+_FMT_CODE_TO_PA = {
+    8: _PA_INT8,
+    16: _PA_INT16,
+    24: _PA_INT24,
+    32: _PA_INT32,
+    33: _PA_FLOAT32,
+    34: _PA_INT24,
+}
+# Reverse mapping used for storage, 34 is only accepted as an alias for 24
+_FMT_PA_TO_CODE = {pa: code for code, pa in _FMT_CODE_TO_PA.items() if code != 34}
+
 
 class ConfigManager:
     """Manages loading and saving configuration from/to TOML files."""
@@ -15,6 +37,17 @@ class ConfigManager:
     DEFAULT_CONFIG_FILE = "default_config.toml"
     USER_CONFIG_FILE = "config.toml"
 
+    # Known top-level tables, mapped to the sub-tables nested inside them
+    _SCHEMA_SECTIONS = {
+        "mqtt": ("topics",),
+        "audio": (),
+        "ui": (),
+        "microphones": (),
+    }
+
+    # Parsed config files keyed by path, with the (mtime, size) they were read at
+    _cache: Dict[str, tuple] = {}
+
     @staticmethod
     def get_default_config():
         """Return the default configuration as a dictionary."""
@@ -25,14 +58,16 @@ class ConfigManager:
                 "port": 1883,
                 "client_id": "mic_monitor",
                 "topics": {"left": "microphones/left", "right": "microphones/right"},
+                "heartbeat_interval": 1.0,
+                "min_republish_interval": 0.2,
             },
             "audio": {
                 "chunk_size": 1024,
-                "sample_format": pyaudio.paInt16,
+                # Storage code like in the TOML files, converted by load_config
+                "sample_format": 16,
                 "channels": 1,
                 "rate": 44100,
-                "threshold": 500,
-                "check_interval": 0.2,
+                "threshold": 600,
             },
             "ui": {"refresh_rate": 0.1},
         }
@@ -41,27 +76,34 @@ class ConfigManager:
     @staticmethod
     def _convert_sample_format(format_code):
         """Convert numeric sample format code to pyaudio constant."""
-        format_map = {
-            8: pyaudio.paInt8,
-            16: pyaudio.paInt16,
-            24: pyaudio.paInt24,
-            32: pyaudio.paInt32,
-            33: pyaudio.paFloat32,
-            34: pyaudio.paInt24,
-        }
-        return format_map.get(format_code, pyaudio.paInt16)
+        return _FMT_CODE_TO_PA.get(format_code, _PA_INT16)
 
     @staticmethod
     def _convert_sample_format_to_code(format_const):
         """Convert pyaudio constant to numeric code for storage."""
-        format_map = {
-            pyaudio.paInt8: 8,
-            pyaudio.paInt16: 16,
-            pyaudio.paInt24: 24,
-            pyaudio.paInt32: 32,
-            pyaudio.paFloat32: 33,
-        }
-        return format_map.get(format_const, 16)
+        return _FMT_PA_TO_CODE.get(format_const, 16)
+
+    @classmethod
+    def _load_toml_cached(cls, path):
+        """Load a TOML file, reusing the parsed result while it is unchanged.
+
+        Returns None if the file does not exist.
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            cls._cache.pop(path, None)
+            return None
+
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = cls._cache.get(path)
+        if cached is None or cached[0] != key:
+            with open(path, "rb") as f:
+                cached = (key, tomllib.load(f))
+            cls._cache[path] = cached
+
+        # Hand out a copy so callers can't mutate the cached tree
+        return copy.deepcopy(cached[1])
 
     @classmethod
     def load_config(cls):
@@ -69,24 +111,22 @@ class ConfigManager:
         config = cls.get_default_config()
 
         # Try to load default config file
-        if os.path.exists(cls.DEFAULT_CONFIG_FILE):
-            try:
-                with open(cls.DEFAULT_CONFIG_FILE, "r") as f:
-                    default_from_file = toml.load(f)
-                    # Merge with defaults
-                    cls._merge_configs(config, default_from_file)
-            except Exception as e:
-                print(f"Error loading default config file: {e}")
+        try:
+            default_from_file = cls._load_toml_cached(cls.DEFAULT_CONFIG_FILE)
+            if default_from_file is not None:
+                # Merge with defaults
+                cls._merge_known_schema(config, default_from_file)
+        except Exception as e:
+            print(f"Error loading default config file: {e}")
 
         # Try to load user config file (overrides defaults)
-        if os.path.exists(cls.USER_CONFIG_FILE):
-            try:
-                with open(cls.USER_CONFIG_FILE, "r") as f:
-                    user_config = toml.load(f)
-                    # Merge with base config
-                    cls._merge_configs(config, user_config)
-            except Exception as e:
-                print(f"Error loading user config file: {e}")
+        try:
+            user_config = cls._load_toml_cached(cls.USER_CONFIG_FILE)
+            if user_config is not None:
+                # Merge with base config
+                cls._merge_known_schema(config, user_config)
+        except Exception as e:
+            print(f"Error loading user config file: {e}")
 
         # Convert numeric sample format to pyaudio constant
         if "audio" in config and "sample_format" in config["audio"]:
@@ -103,6 +143,9 @@ class ConfigManager:
         # Create a copy of the config to modify before saving
         save_config = cls._create_saveable_config(config)
 
+        # Never serve a stale parse of the file being rewritten
+        cls._cache.pop(cls.USER_CONFIG_FILE, None)
+
         try:
             with open(cls.USER_CONFIG_FILE, "w") as f:
                 toml.dump(save_config, f)
@@ -114,10 +157,11 @@ class ConfigManager:
     @classmethod
     def _create_saveable_config(cls, config):
         """Create a copy of config suitable for saving to TOML."""
-        # Deep copy the config
-        import copy
-
-        save_config = copy.deepcopy(config)
+        # Copy the sections, only the audio table is modified below
+        save_config = {
+            key: dict(value) if isinstance(value, dict) else value
+            for key, value in config.items()
+        }
 
         # Convert pyaudio constant to numeric code
         if "audio" in save_config and "sample_format" in save_config["audio"]:
@@ -127,20 +171,44 @@ class ConfigManager:
 
         return save_config
 
+    @classmethod
+    def _merge_known_schema(cls, base_config, override_config):
+        """Merge override_config into base_config following the config schema."""
+        for section, values in override_config.items():
+            target = base_config.get(section)
+            if not (isinstance(target, dict) and isinstance(values, dict)):
+                # Override or add value
+                base_config[section] = values
+            elif section in cls._SCHEMA_SECTIONS:
+                # Known sections are flat apart from their listed sub-tables
+                nested = {
+                    key: {**target[key], **values[key]}
+                    for key in cls._SCHEMA_SECTIONS[section]
+                    if isinstance(target.get(key), dict)
+                    and isinstance(values.get(key), dict)
+                }
+                target.update(values)
+                target.update(nested)
+            else:
+                # Unknown sections keep the generic recursive merge
+                cls._merge_configs(target, values)
+
+        return base_config
+
     @staticmethod
     def _merge_configs(base_config, override_config):
-        """Recursively merge override_config into base_config."""
-        for key, value in override_config.items():
-            if (
-                key in base_config
-                and isinstance(base_config[key], dict)
-                and isinstance(value, dict)
-            ):
-                # Recursively merge nested dictionaries
-                ConfigManager._merge_configs(base_config[key], value)
-            else:
-                # Override or add value
-                base_config[key] = value
+        """Deep merge override_config into base_config."""
+        # Walk nested tables with an explicit stack instead of recursing
+        stack = [(base_config, override_config)]
+        while stack:
+            base, override = stack.pop()
+            for key, value in override.items():
+                if isinstance(value, dict) and isinstance(base.get(key), dict):
+                    # Merge nested dictionaries
+                    stack.append((base[key], value))
+                else:
+                    # Override or add value
+                    base[key] = value
 
         return base_config
 
@@ -148,12 +216,13 @@ class ConfigManager:
     def create_default_config_file(cls):
         """Create a default config file if it doesn't exist."""
         if not os.path.exists(cls.DEFAULT_CONFIG_FILE):
+            # The defaults already use the storage format
             config = cls.get_default_config()
-            saveable_config = cls._create_saveable_config(config)
+            cls._cache.pop(cls.DEFAULT_CONFIG_FILE, None)
 
             try:
                 with open(cls.DEFAULT_CONFIG_FILE, "w") as f:
-                    toml.dump(saveable_config, f)
+                    toml.dump(config, f)
                 return True
             except Exception as e:
                 print(f"Error creating default config file: {e}")
@@ -3,12 +3,10 @@
 Core monitoring functionality for the microphone monitor.
 """
 
-import json
 import signal
-import sys
 import threading
 import time
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
 from rich.live import Live
 
@@ -21,6 +19,12 @@ from mic_level_monitor.ui.layout import MonitorUI
 class MicrophoneMonitor:
     """Main monitor class that coordinates all components."""
 
+    # Fixed-schema state payload, formatted without going through json
+    _PAYLOAD_TMPL = b'{"state":%d,"level":%.2f,"timestamp":%.3f}'
+
+    # Relative level change that justifies a republish between heartbeats
+    _LEVEL_CHANGE_RATIO = 0.15
+
     def __init__(self, config: Dict = None):
         """Initialize the microphone monitor with configuration."""
         # Load config, overriding with any provided values
@@ -35,8 +39,14 @@ class MicrophoneMonitor:
 
         # State variables
         self.running = False
+        self._stop = threading.Event()
+        self._monitor_thread = None
         self.left_last_state = 0
         self.right_last_state = 0
+        self.left_last_publish_ts = 0.0
+        self.right_last_publish_ts = 0.0
+        self.left_last_publish_level = 0.0
+        self.right_last_publish_level = 0.0
 
     def _update_config(self, config: Dict) -> None:
         """Update the configuration with user provided values."""
@@ -48,8 +58,9 @@ class MicrophoneMonitor:
 
     def _handle_mqtt_error(self, error_message: str) -> None:
         """Error handler callback for MQTT client."""
-        self.ui.error_message = error_message
-        self.ui.print_error(error_message)
+        # Shown in the status panel only, printing from paho's network thread
+        # would make the live display render the layout while it is updated
+        self.ui.update_state(error_message=error_message)
 
     def print_input_devices(self) -> None:
         """Print all available audio input devices to the console."""
@@ -102,81 +113,165 @@ class MicrophoneMonitor:
         self.config["microphones"]["right_index"] = right_index
         ConfigManager.save_config(self.config)
 
-        # Update UI device names
-        self.ui.set_device_names(
-            self.mic_manager.get_device_name(left_index),
-            self.mic_manager.get_device_name(right_index),
-        )
+        # Look up device names once, the UI keeps its own copy for rendering
+        left_name = self.mic_manager.get_device_name(left_index)
+        right_name = self.mic_manager.get_device_name(right_index)
+        self.ui.set_device_names(left_name, right_name)
 
         # Print selected microphones info
-        self.ui.console.print(
-            f"[green]Using LEFT mic:[/green] {self.mic_manager.get_device_name(left_index)}"
-        )
-        self.ui.console.print(
-            f"[green]Using RIGHT mic:[/green] {self.mic_manager.get_device_name(right_index)}"
-        )
-
-    def publish_mic_state(self, topic: str, state: int, level: float) -> None:
-        """Publish microphone state to MQTT topic."""
-        payload = json.dumps(
-            {"state": state, "level": float(level), "timestamp": time.time()}
-        )
-        if self.mqtt_client.publish(topic, payload):
-            # Update UI state
-            self.ui.update_state(
-                mqtt_messages_sent=self.mqtt_client.mqtt_messages_sent,
-                last_message_time=self.mqtt_client.last_message_time,
-                last_message=self.mqtt_client.last_message,
-            )
+        self.ui.console.print(f"[green]Using LEFT mic:[/green] {left_name}")
+        self.ui.console.print(f"[green]Using RIGHT mic:[/green] {right_name}")
+
+    def format_mic_state(self, state: int, level: float, timestamp: float) -> bytes:
+        """Format a microphone state payload."""
+        return self._PAYLOAD_TMPL % (state, level, timestamp)
+
+    def publish_mic_states(self, messages: List[Tuple[str, bytes]]) -> None:
+        """Queue a batch of microphone state messages for MQTT."""
+        self.mqtt_client.publish_many(messages)
+
+    @classmethod
+    def _publish_due(
+        cls,
+        active: int,
+        last_state: int,
+        level: float,
+        last_level: float,
+        elapsed: float,
+        heartbeat_interval: float,
+        min_republish_interval: float,
+    ) -> bool:
+        """Check whether a microphone's state should be published now.
+
+        Nothing is published within min_republish_interval of the previous
+        message, so a level hovering around the threshold cannot flood the
+        broker with edges. A deferred edge is published once the interval
+        has passed, if the state still differs then.
+        """
+        if elapsed < min_republish_interval:
+            return False
+
+        # A non-zero XOR with the last published state is an edge
+        if active ^ last_state:
+            return True
+
+        if not active:
+            return False
+
+        # Active microphones get a heartbeat
+        if elapsed >= heartbeat_interval:
+            return True
+
+        # Between heartbeats, only significant level changes are republished
+        return abs(level - last_level) > cls._LEVEL_CHANGE_RATIO * last_level
 
     def monitoring_thread(self) -> None:
         """Thread function to monitor microphones and publish to MQTT."""
         threshold = self.config["audio"]["threshold"]
         left_topic = self.config["mqtt"]["topics"]["left"]
         right_topic = self.config["mqtt"]["topics"]["right"]
+        heartbeat_interval = self.config["mqtt"]["heartbeat_interval"]
+        min_republish_interval = self.config["mqtt"]["min_republish_interval"]
+
+        # Bind components locally, the loop runs once per captured chunk
+        mic = self.mic_manager
+        mqtt = self.mqtt_client
+        ui = self.ui
 
-        while self.running:
+        # Stream liveness is checked on its own schedule, a single live stream
+        # keeps the loop below waking up even if the other one has died
+        stream_check_interval = mic.stream_timeout
+        next_stream_check = time.monotonic() + stream_check_interval
+
+        while not self._stop.is_set():
             try:
-                # Read levels from both microphones
-                left_level, right_level = self.mic_manager.read_levels()
+                # Wake up whenever the audio stream callbacks deliver a chunk
+                mic.wait_for_levels(timeout=stream_check_interval)
+
+                if time.monotonic() >= next_stream_check:
+                    if not self._stop.is_set() and not mic.ensure_streams_active():
+                        ui.update_state(
+                            error_message=f"Failed to reopen audio streams: "
+                            f"{mic.error_message}"
+                        )
+                    next_stream_check = time.monotonic() + stream_check_interval
+
+                # Latest levels computed by the audio stream callbacks, 0.0 for
+                # a stream that stopped, so its going inactive is published
+                left_level, right_level = mic.read_levels()
 
                 # Determine if levels exceed threshold
-                left_active = 1 if left_level > threshold else 0
-                right_active = 1 if right_level > threshold else 0
+                left_active = int(left_level > threshold)
+                right_active = int(right_level > threshold)
 
                 # Update UI state
-                self.ui.update_state(
-                    left_level=left_level,
-                    left_active=left_active,
-                    right_level=right_level,
-                    right_active=right_active,
-                    mqtt_connected=self.mqtt_client.mqtt_connected,
-                    mqtt_reconnecting=self.mqtt_client.mqtt_reconnecting,
-                    reconnect_attempts=self.mqtt_client.reconnect_attempts,
+                ui.update_levels(left_level, left_active, right_level, right_active)
+                ui.update_state(
+                    mqtt_connected=mqtt.mqtt_connected,
+                    mqtt_reconnecting=mqtt.mqtt_reconnecting,
+                    reconnect_attempts=mqtt.reconnect_attempts,
+                    # Messages are sent by the MQTT publisher thread, pick up
+                    # its counters here
+                    mqtt_messages_sent=mqtt.mqtt_messages_sent,
+                    last_message_time=mqtt.last_message_time,
+                    last_message=mqtt.last_message,
                 )
 
-                # Only publish to MQTT if state changed or crossed threshold
-                if self.mqtt_client.mqtt_connected:  # Only try to publish if connected
-                    if left_active != self.left_last_state or left_active == 1:
-                        self.publish_mic_state(left_topic, left_active, left_level)
+                # Publish on state changes, plus a heartbeat while active
+                if mqtt.mqtt_connected:  # Only try to publish if connected
+                    # Monotonic clock for the heartbeat, immune to wall-clock jumps
+                    now = time.monotonic()
+                    due = []
+
+                    if self._publish_due(
+                        left_active,
+                        self.left_last_state,
+                        left_level,
+                        self.left_last_publish_level,
+                        now - self.left_last_publish_ts,
+                        heartbeat_interval,
+                        min_republish_interval,
+                    ):
+                        due.append((left_topic, left_active, left_level))
                         self.left_last_state = left_active
-
-                    if right_active != self.right_last_state or right_active == 1:
-                        self.publish_mic_state(right_topic, right_active, right_level)
+                        self.left_last_publish_ts = now
+                        self.left_last_publish_level = left_level
+
+                    if self._publish_due(
+                        right_active,
+                        self.right_last_state,
+                        right_level,
+                        self.right_last_publish_level,
+                        now - self.right_last_publish_ts,
+                        heartbeat_interval,
+                        min_republish_interval,
+                    ):
+                        due.append((right_topic, right_active, right_level))
                         self.right_last_state = right_active
-
-                # Short delay
-                time.sleep(self.config["audio"]["check_interval"])
+                        self.right_last_publish_ts = now
+                        self.right_last_publish_level = right_level
+
+                    # Send both microphones' updates as one batch, one timestamp
+                    if due:
+                        timestamp = time.time()
+                        self.publish_mic_states(
+                            [
+                                (topic, self.format_mic_state(state, level, timestamp))
+                                for topic, state, level in due
+                            ]
+                        )
 
             except Exception as e:
-                self.ui.error_message = f"Error monitoring: {e}"
-                time.sleep(1)  # Prevent tight error loops
+                self.ui.update_state(error_message=f"Error monitoring: {e}")
+                self._stop.wait(1)  # Prevent tight error loops
 
     def start_monitoring(self) -> None:
         """Start monitoring the microphones and display the TUI."""
         # Open audio streams
         if not self.mic_manager.open_streams():
-            self.ui.print_error("Failed to open audio streams")
+            self.ui.print_error(
+                f"Failed to open audio streams: {self.mic_manager.error_message}"
+            )
             return
 
         # Connect to MQTT broker
@@ -186,29 +281,43 @@ class MicrophoneMonitor:
         self.mqtt_client.start_status_check()
 
         self.running = True
+        self._stop.clear()
 
         # Start the monitoring in a separate thread
-        monitor_thread = threading.Thread(target=self.monitoring_thread)
-        monitor_thread.daemon = True
-        monitor_thread.start()
+        self._monitor_thread = threading.Thread(target=self.monitoring_thread)
+        self._monitor_thread.daemon = True
+        self._monitor_thread.start()
 
-        # Set up signal handler to gracefully exit on Ctrl+C
+        # Set up signal handler to gracefully exit on Ctrl+C. It only asks the
+        # loops to stop, the handler may interrupt the layout mid-update, so
+        # cleanup (which prints) runs after the live display has closed
         def handle_signal(sig, frame):
             self.running = False
-            time.sleep(0.5)  # Give monitoring thread time to exit
-            self.cleanup()
-            sys.exit(0)
+            self._stop.set()
+            self.ui.wake()
 
         signal.signal(signal.SIGINT, handle_signal)
 
         # Start the live display
         try:
+            # The layout is updated in place, so it must only be rendered from
+            # this loop: auto-refresh is off, and nothing else writes to the
+            # console while Live is active (any output makes Live redraw the
+            # layout), other threads report errors through ui.update_state
             with Live(
-                self.ui.generate_layout(), refresh_per_second=5, screen=True
+                self.ui.generate_layout(), auto_refresh=False, screen=True
             ) as live:
                 while self.running:
-                    live.update(self.ui.generate_layout())
-                    time.sleep(self.config["ui"]["refresh_rate"])
+                    # Sleep until the state changes, but re-render at least once
+                    # a second so the age of the last message keeps counting
+                    self.ui.wait_for_update(timeout=1.0)
+
+                    # Skip the update when nothing visible has changed
+                    if self.ui.needs_render():
+                        live.update(self.ui.generate_layout(), refresh=True)
+
+                    # refresh_rate now caps how often the layout is redrawn
+                    self._stop.wait(self.config["ui"]["refresh_rate"])
         except Exception as e:
             self.ui.error_message = f"Error in UI: {e}"
             self.ui.print_error(self.ui.error_message)
@@ -218,6 +327,11 @@ class MicrophoneMonitor:
     def cleanup(self) -> None:
         """Clean up resources."""
         self.running = False
+        self._stop.set()
+
+        # The monitoring thread wakes on every audio chunk, so it exits promptly
+        if self._monitor_thread and self._monitor_thread.is_alive():
+            self._monitor_thread.join(timeout=1.0)
 
         # Close audio streams
         self.mic_manager.close_streams()
@@ -3,7 +3,8 @@
 MQTT Client module for mic_level_monitor.
 """
 
-import json
+import queue
+import socket
 import time
 import threading
 import paho.mqtt.client as mqtt
@@ -12,6 +13,59 @@ import paho.mqtt.client as mqtt
 class MQTTClient:
     """MQTT Client for microphone monitor."""
 
+    # Fixed attribute set, read on every publish
+    __slots__ = (
+        "config",
+        "mqtt_client",
+        "mqtt_connected",
+        "mqtt_reconnecting",
+        "reconnect_attempts",
+        "error_message",
+        "error_callback",
+        "mqtt_messages_sent",
+        "last_message_time",
+        "running",
+        "_last_error",
+        "_last_error_ts",
+        "_last_sent",
+        "_last_message",
+        "_last_message_src",
+        "_stop_event",
+        "_reconnect_thread",
+        "_disconnect_event",
+        "_tx_queue",
+        "_publisher_thread",
+    )
+
+    # Status payloads, encoded once instead of on every (re)connect
+    _ONLINE_PAYLOAD = b'{"status": "online"}'
+    _OFFLINE_PAYLOAD = b'{"status": "offline"}'
+
+    # Queued messages are flushed in bursts: after this many seconds, or as
+    # soon as this many messages are waiting
+    _BATCH_WINDOW = 0.02
+    _BATCH_MAX = 64
+
+    # Queued by disconnect() to wake the publisher thread and make it exit
+    _STOP = object()
+
+    # The connection supervisor sleeps until paho reports a disconnect, with a
+    # slow watchdog as a backstop. After a disconnect paho gets a grace period
+    # to reconnect on its own before the client is rebuilt.
+    _WATCHDOG_INTERVAL = 30.0
+    _RECONNECT_GRACE = 10.0
+
+    # Forced reconnections reuse the existing client, it is only rebuilt
+    # after this many consecutive failed attempts
+    _REBUILD_AFTER = 3
+
+    # paho's PINGREQ keepalive is the only liveness check, a dead connection
+    # is reported through on_disconnect within about 1.5 times this
+    _KEEPALIVE = 15
+
+    # Repeats of the same error within this many seconds are not reported
+    _ERROR_DEDUP_WINDOW = 0.5
+
     def __init__(self, config, error_callback=None):
         """Initialize the MQTT client with the provided configuration."""
         self.config = config
@@ -20,21 +74,69 @@ class MQTTClient:
         self.reconnect_attempts = 0
         self.error_message = ""
         self.error_callback = error_callback
+        self._last_error = None
+        self._last_error_ts = 0.0
         self.mqtt_messages_sent = 0
         self.last_message_time = 0
-        self.last_message = ""
+        # Last published (topic, payload), formatted only when read
+        self._last_sent = None
+        self._last_message = ""
+        self._last_message_src = None
         self.running = False
+        self._stop_event = threading.Event()
+        self._reconnect_thread = None
+        self._disconnect_event = threading.Event()
+
+        # Outgoing message queue drained by the publisher thread
+        self._tx_queue = queue.SimpleQueue()
+        self._publisher_thread = None
 
         # Initialize MQTT client with version 2 API
-        self.mqtt_client = mqtt.Client(
-            client_id=self.config["mqtt"]["client_id"],
+        self.mqtt_client = self._create_client(self.config["mqtt"]["client_id"])
+
+    def _create_client(self, client_id):
+        """Create a paho client wired to this instance's callbacks."""
+        client = mqtt.Client(
+            client_id=client_id,
             callback_api_version=mqtt.CallbackAPIVersion.VERSION2,
             clean_session=True,
         )
 
         # Set up MQTT callbacks
-        self.mqtt_client.on_connect = self.on_mqtt_connect
-        self.mqtt_client.on_disconnect = self.on_mqtt_disconnect
+        client.on_connect = self.on_mqtt_connect
+        client.on_disconnect = self.on_mqtt_disconnect
+        client.on_connect_fail = self.on_mqtt_connect_fail
+        client.on_socket_open = self._tune_socket
+        return client
+
+    @staticmethod
+    def _tune_socket(client, userdata, sock):
+        """Disable Nagle's algorithm on a newly opened broker socket.
+
+        State messages are small and time sensitive, they should go out
+        right away instead of waiting for the previous packet's ACK.
+        """
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except (AttributeError, OSError):
+            # Not a plain TCP socket (e.g. unix or websocket transport)
+            pass
+
+    def _emit_error(self, message):
+        """Report an error message, dropping quick repeats of the same one."""
+        if not self.error_callback:
+            return
+
+        now = time.monotonic()
+        if (
+            message == self._last_error
+            and now - self._last_error_ts < self._ERROR_DEDUP_WINDOW
+        ):
+            return
+
+        self._last_error = message
+        self._last_error_ts = now
+        self.error_callback(message)
 
     def on_mqtt_connect(self, client, userdata, flags, reason_code, properties, *args):
         """Callback when connected to MQTT broker."""
@@ -48,7 +150,7 @@ class MQTTClient:
             try:
                 self.mqtt_client.publish(
                     "microphones/status",
-                    payload=json.dumps({"status": "online"}),
+                    payload=self._ONLINE_PAYLOAD,
                     qos=1,
                     retain=True,
                 )
@@ -58,8 +160,7 @@ class MQTTClient:
             self.mqtt_connected = False
             self.error_message = f"Failed to connect to MQTT broker: {reason_code}"
 
-        if self.error_callback:
-            self.error_callback(self.error_message)
+        self._emit_error(self.error_message)
 
     def on_mqtt_disconnect(self, client, userdata, reason_code, properties, *args):
         """Callback when disconnected from MQTT broker."""
@@ -67,8 +168,20 @@ class MQTTClient:
         self.mqtt_reconnecting = True
         self.error_message = f"Disconnected from MQTT broker: {reason_code}"
 
-        if self.error_callback:
-            self.error_callback(self.error_message)
+        self._emit_error(self.error_message)
+
+        # Wake the connection supervisor
+        self._disconnect_event.set()
+
+    def on_mqtt_connect_fail(self, client, userdata, *args):
+        """Callback when a (re)connection attempt to the MQTT broker fails."""
+        self.mqtt_connected = False
+        self.mqtt_reconnecting = True
+        self.error_message = "Failed to connect to MQTT broker"
+        self._emit_error(self.error_message)
+
+        # Wake the connection supervisor, like a disconnect does
+        self._disconnect_event.set()
 
     def connect(self):
         """Connect to the MQTT broker."""
@@ -79,24 +192,24 @@ class MQTTClient:
             # Set will message
             self.mqtt_client.will_set(
                 "microphones/status",
-                payload=json.dumps({"status": "offline"}),
+                payload=self._OFFLINE_PAYLOAD,
                 qos=1,
                 retain=True,
             )
 
-            # Connect with longer keepalive
             self.mqtt_client.connect_async(
                 self.config["mqtt"]["broker"],
                 self.config["mqtt"]["port"],
-                keepalive=60,
+                keepalive=self._KEEPALIVE,
             )
             self.mqtt_client.loop_start()
 
+            self._start_publisher()
+
             return True
         except Exception as e:
             self.error_message = f"Failed to connect to MQTT broker: {e}"
-            if self.error_callback:
-                self.error_callback(self.error_message)
+            self._emit_error(self.error_message)
             return False
 
     # def disconnect(self):
@@ -122,6 +235,17 @@ class MQTTClient:
     def disconnect(self):
         """Disconnect from the MQTT broker."""
         self.running = False
+        self._stop_event.set()
+        self._disconnect_event.set()
+
+        # Send whatever is still queued before going offline. The publisher
+        # flushes the queue itself when it reaches the stop marker, it only
+        # has to be done here if it never ran.
+        if self._publisher_thread:
+            self._tx_queue.put_nowait(self._STOP)
+            self._publisher_thread.join(timeout=1.0)
+        else:
+            self._flush_pending()
 
         # Send offline status if connected
         if self.mqtt_client.is_connected():
@@ -129,15 +253,14 @@ class MQTTClient:
                 # Publish offline status
                 self.mqtt_client.publish(
                     "microphones/status",
-                    payload=json.dumps({"status": "offline"}),
+                    payload=self._OFFLINE_PAYLOAD,
                     qos=1,
                     retain=True,
                 )
                 # Small delay to allow message to be sent
                 time.sleep(0.2)
             except Exception as e:
-                if self.error_callback:
-                    self.error_callback(f"Failed to publish offline status: {e}")
+                self._emit_error(f"Failed to publish offline status: {e}")
 
         # Stop network loop and disconnect
         self.mqtt_client.loop_stop()
@@ -145,147 +268,241 @@ class MQTTClient:
             self.mqtt_client.disconnect()
 
     def publish(self, topic, payload):
-        """Publish a message to a topic."""
+        """Queue a message to a topic for the publisher thread.
+
+        Payloads should be bytes, str payloads are encoded here once.
+        """
         if not self.mqtt_connected:
             return False
 
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        self._tx_queue.put_nowait((topic, payload))
+        return True
+
+    def publish_many(self, messages):
+        """Queue (topic, payload) messages for the publisher thread.
+
+        Returns the number of messages queued, nothing is queued while the
+        client is disconnected. Payloads should be bytes, str payloads are
+        encoded here once.
+        """
+        if not self.mqtt_connected:
+            return 0
+
+        for topic, payload in messages:
+            if isinstance(payload, str):
+                payload = payload.encode("utf-8")
+            self._tx_queue.put_nowait((topic, payload))
+        return len(messages)
+
+    def _start_publisher(self):
+        """Start the thread that flushes queued messages."""
+        if self._publisher_thread and self._publisher_thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._publisher_thread = threading.Thread(target=self._publisher_loop)
+        self._publisher_thread.daemon = True
+        self._publisher_thread.start()
+
+    def _publisher_loop(self):
+        """Flush queued messages in bursts until the stop marker arrives."""
+        while True:
+            first = self._tx_queue.get()
+            if first is self._STOP:
+                break
+            batch = [first]
+
+            # Give messages arriving right after the first one a chance to
+            # join the same burst
+            stopping = self._drain_batch(batch)
+            if not stopping and len(batch) < self._BATCH_MAX:
+                self._stop_event.wait(self._BATCH_WINDOW)
+                stopping = self._drain_batch(batch)
+
+            if self.mqtt_connected:
+                self._publish_batch(batch)
+            if stopping:
+                break
+
+        # Messages queued behind the stop marker still go out
+        self._flush_pending()
+
+    def _drain_batch(self, batch):
+        """Move queued messages into batch without blocking, up to _BATCH_MAX.
+
+        Returns True if the stop marker was taken off the queue.
+        """
         try:
-            result = self.mqtt_client.publish(topic, payload)
-            if result.rc == mqtt.MQTT_ERR_SUCCESS:
-                self.mqtt_messages_sent += 1
-                self.last_message_time = time.time()
-                self.last_message = f"{topic}: {payload}"
-                return True
-            else:
-                self.error_message = f"MQTT publish failed with code: {result.rc}"
-                if self.error_callback:
-                    self.error_callback(self.error_message)
-                return False
+            while len(batch) < self._BATCH_MAX:
+                message = self._tx_queue.get_nowait()
+                if message is self._STOP:
+                    return True
+                batch.append(message)
+        except queue.Empty:
+            pass
+        return False
+
+    def _flush_pending(self):
+        """Publish all queued messages in bursts."""
+        while True:
+            batch = []
+            self._drain_batch(batch)
+            if not batch:
+                return
+            if self.mqtt_connected:
+                self._publish_batch(batch)
+
+    def _publish_batch(self, messages):
+        """Publish (topic, payload) messages back to back.
+
+        Stops at the first failure and returns the number of messages sent.
+        """
+
+        sent = 0
+        try:
+            for topic, payload in messages:
+                result = self.mqtt_client.publish(topic, payload)
+                if result.rc != mqtt.MQTT_ERR_SUCCESS:
+                    self.error_message = f"MQTT publish failed with code: {result.rc}"
+                    self._emit_error(self.error_message)
+                    break
+                sent += 1
         except Exception as e:
             self.error_message = f"Error publishing to MQTT: {e}"
-            if self.error_callback:
-                self.error_callback(self.error_message)
-            return False
+            self._emit_error(self.error_message)
+
+        # Update the bookkeeping once for the whole batch
+        if sent:
+            self.mqtt_messages_sent += sent
+            # Monotonic, only used to show how long ago the last message went out
+            self.last_message_time = time.monotonic()
+            self._last_sent = messages[sent - 1]
+
+        return sent
+
+    @property
+    def last_message(self):
+        """The last published message as "topic: payload"."""
+        sent = self._last_sent
+        if sent is not self._last_message_src:
+            topic, payload = sent
+            if isinstance(payload, bytes):
+                payload = payload.decode()
+            self._last_message = f"{topic}: {payload}"
+            self._last_message_src = sent
+        return self._last_message
 
     def force_reconnection(self):
-        """Force MQTT client to disconnect and reconnect with proper cleanup."""
+        """Force MQTT client to reconnect, reusing the client when possible."""
         try:
-            # Stop the network loop
-            self.mqtt_client.loop_stop()
-
-            # Force disconnect if still connected
-            try:
-                self.mqtt_client.disconnect()
-            except:
-                pass
-
             # Clear connection state
             self.mqtt_connected = False
             self.mqtt_reconnecting = True
             self.reconnect_attempts += 1
 
-            # Give network sockets time to close
-            time.sleep(1)
-
-            # Create a new client instance to ensure clean state
-            self.mqtt_client = mqtt.Client(
-                client_id=f"{self.config['mqtt']['client_id']}_{int(time.time())}",
-                callback_api_version=mqtt.CallbackAPIVersion.VERSION2,
-                clean_session=True,
-            )
-
-            # Set up MQTT callbacks
-            self.mqtt_client.on_connect = self.on_mqtt_connect
-            self.mqtt_client.on_disconnect = self.on_mqtt_disconnect
-
-            # Reconfigure client
-            self.mqtt_client.reconnect_delay_set(min_delay=1, max_delay=30)
-
-            # Set will message
-            self.mqtt_client.will_set(
-                "microphones/status",
-                payload=json.dumps({"status": "offline"}),
-                qos=1,
-                retain=True,
-            )
-
-            # Try to connect
-            self.mqtt_client.connect_async(
-                self.config["mqtt"]["broker"], self.config["mqtt"]["port"], keepalive=60
-            )
-
-            # Restart network loop
-            self.mqtt_client.loop_start()
+            # Stop the network loop while the socket is replaced
+            self.mqtt_client.loop_stop()
+            try:
+                # reconnect() closes the old socket and opens a new one
+                self.mqtt_client.reconnect()
+            except Exception:
+                if self.reconnect_attempts < self._REBUILD_AFTER:
+                    raise
+                self._rebuild_client()
+            finally:
+                # Restart network loop, it keeps retrying with backoff
+                self.mqtt_client.loop_start()
 
             self.error_message = (
                 f"Forcing reconnection (attempt {self.reconnect_attempts})..."
             )
-            if self.error_callback:
-                self.error_callback(self.error_message)
+            self._emit_error(self.error_message)
 
             return True
         except Exception as e:
             self.error_message = f"Reconnection failed: {e}"
-            if self.error_callback:
-                self.error_callback(self.error_message)
+            self._emit_error(self.error_message)
             return False
 
+    def _rebuild_client(self):
+        """Replace the paho client with a fresh one to ensure clean state."""
+        try:
+            self.mqtt_client.disconnect()
+        except Exception:
+            pass
+
+        self.mqtt_client = self._create_client(
+            f"{self.config['mqtt']['client_id']}_{int(time.time())}"
+        )
+
+        # Reconfigure client
+        self.mqtt_client.reconnect_delay_set(min_delay=1, max_delay=30)
+
+        # Set will message
+        self.mqtt_client.will_set(
+            "microphones/status",
+            payload=self._OFFLINE_PAYLOAD,
+            qos=1,
+            retain=True,
+        )
+
+        # Try to connect
+        self.mqtt_client.connect_async(
+            self.config["mqtt"]["broker"],
+            self.config["mqtt"]["port"],
+            keepalive=self._KEEPALIVE,
+        )
+
+    def _start_force_reconnection(self):
+        """Run force_reconnection on a worker thread unless one is in progress."""
+        if self._reconnect_thread and self._reconnect_thread.is_alive():
+            return
+
+        self._reconnect_thread = threading.Thread(target=self.force_reconnection)
+        self._reconnect_thread.daemon = True
+        self._reconnect_thread.start()
+
     def start_status_check(self):
         """Start a thread to monitor MQTT connection status."""
         self.running = True
+        self._stop_event.clear()
+        self._disconnect_event.clear()
         status_thread = threading.Thread(target=self._status_check_thread)
         status_thread.daemon = True
         status_thread.start()
         return status_thread
 
     def _status_check_thread(self):
-        """Thread to actively verify MQTT connection status."""
-        disconnected_count = 0
-
+        """Thread to supervise the MQTT connection and force reconnections."""
         while self.running:
             try:
-                # Get current reported state
-                reported_connected = self.mqtt_client.is_connected()
-
-                if reported_connected:
-                    # If client reports connected, try a simple publish to verify
-                    try:
-                        result = self.mqtt_client.publish(
-                            "microphones/ping", "ping", qos=0
-                        )
-                        if result.rc == mqtt.MQTT_ERR_SUCCESS:
-                            # Successful publish request
-                            self.mqtt_connected = True
-                            disconnected_count = 0
-                            self.mqtt_reconnecting = False
-                        else:
-                            # Failed to send publish request
-                            disconnected_count += 1
-                    except:
-                        # Exception during publish
-                        disconnected_count += 1
-                else:
-                    # Client reports not connected
-                    disconnected_count += 1
-                    self.mqtt_connected = False
-
-                # Update UI status based on disconnection count
-                if disconnected_count >= 3:
-                    self.mqtt_connected = False
-                    self.error_message = "Disconnected from MQTT broker"
-                    if self.error_callback:
-                        self.error_callback(self.error_message)
-
-                    # After several consecutive failures, try to force reconnection
-                    if disconnected_count == 5:  # Reduced for faster recovery
-                        self.force_reconnection()
-                        # Reset counter to prevent multiple rapid reconnect attempts
-                        disconnected_count = 0
-
-                time.sleep(2)
+                # Sleep until a disconnect is reported or the watchdog expires
+                self._disconnect_event.wait(self._WATCHDOG_INTERVAL)
+                self._disconnect_event.clear()
+                if not self.running:
+                    break
+
+                if self.mqtt_client.is_connected():
+                    self.mqtt_connected = True
+                    self.mqtt_reconnecting = False
+                    continue
+
+                # Let paho's automatic reconnection have a go first
+                if self._stop_event.wait(self._RECONNECT_GRACE):
+                    break
+                if self.mqtt_client.is_connected():
+                    continue
+
+                self.mqtt_connected = False
+                self.error_message = "Disconnected from MQTT broker"
+                self._emit_error(self.error_message)
+
+                # Reconnect in the background so supervision keeps running
+                self._start_force_reconnection()
 
             except Exception as e:
                 self.error_message = f"Connection check error: {e}"
-                if self.error_callback:
-                    self.error_callback(self.error_message)
-                time.sleep(2)
+                self._emit_error(self.error_message)
+                self._stop_event.wait(2)
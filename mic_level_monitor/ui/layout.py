@@ -3,12 +3,14 @@
 Terminal User Interface components for the microphone monitor.
 """
 
+import threading
 import time
-from typing import Dict
+from typing import Dict, Optional
 
-from rich.console import Console
+from rich.console import Console, Group
 from rich.layout import Layout
 from rich.panel import Panel
+from rich.style import Style
 from rich.text import Text
 from rich.table import Table
 from rich.progress_bar import ProgressBar
@@ -17,6 +19,72 @@ from rich.progress_bar import ProgressBar
 class MonitorUI:
     """Terminal User Interface for the microphone monitor."""
 
+    # Fixed attribute set, read on every frame and every audio chunk
+    __slots__ = (
+        "config",
+        "console",
+        "left_level",
+        "left_active",
+        "right_level",
+        "right_active",
+        "mqtt_connected",
+        "mqtt_reconnecting",
+        "reconnect_attempts",
+        "mqtt_messages_sent",
+        "last_message_time",
+        "last_message",
+        "error_message",
+        "left_device_name",
+        "right_device_name",
+        "_updated",
+        "_dirty",
+        "_rendered_age",
+        "_left_name_line",
+        "_right_name_line",
+        "_layout",
+        "_broker_label",
+        "_header_text",
+        "_header_panel",
+        "_left_cells",
+        "_right_cells",
+        "_footer_text",
+        "_footer_panel",
+    )
+
+    # Level changes smaller than this are not worth a redraw, levels are
+    # displayed with two decimals
+    _LEVEL_EPSILON = 0.01
+    _LEVEL_KEYS = ("left_level", "right_level")
+
+    # State fields update_state() accepts, anything else is ignored
+    _ALLOWED = frozenset(
+        {
+            "left_level",
+            "left_active",
+            "right_level",
+            "right_active",
+            "mqtt_connected",
+            "mqtt_reconnecting",
+            "reconnect_attempts",
+            "mqtt_messages_sent",
+            "last_message_time",
+            "last_message",
+            "error_message",
+        }
+    )
+
+    # Styles parsed once instead of from their names on every frame
+    _STYLE_TITLE = Style.parse("bold white")
+    _STYLE_WHITE = Style.parse("white")
+    _STYLE_GREEN = Style.parse("green")
+    _STYLE_BLUE = Style.parse("blue")
+    _STYLE_YELLOW = Style.parse("yellow")
+    _STYLE_RED = Style.parse("red")
+    _STYLE_ERROR = Style.parse("bold red")
+    _STYLE_HEADER_CONNECTED = Style.parse("white on blue")
+    _STYLE_HEADER_RECONNECTING = Style.parse("white on yellow")
+    _STYLE_HEADER_DISCONNECTED = Style.parse("white on red")
+
     def __init__(self, config: Dict):
         """Initialize the UI with configuration."""
         self.config = config
@@ -35,20 +103,97 @@ class MonitorUI:
         self.last_message = ""
         self.error_message = ""
 
-        # Device names
-        self.left_device_name = "Unknown"
-        self.right_device_name = "Unknown"
+        # Set whenever the state changes, so the render loop can sleep meanwhile
+        self._updated = threading.Event()
+
+        # True while the layout does not reflect the current state yet
+        self._dirty = True
+        self._rendered_age = 0
+
+        # Device names, and the panel lines showing them formatted once
+        self.set_device_names("Unknown", "Unknown")
+
+        # Layout tree, built once and updated in place on every frame
+        self._build_layout()
 
     def set_device_names(self, left_name: str, right_name: str) -> None:
         """Set the device names for display."""
         self.left_device_name = left_name
         self.right_device_name = right_name
+        self._left_name_line = f"LEFT MICROPHONE: {left_name}\n"
+        self._right_name_line = f"RIGHT MICROPHONE: {right_name}\n"
+        self._dirty = True
+        self._updated.set()
 
     def update_state(self, **kwargs) -> None:
-        """Update the UI state with provided values."""
+        """Update the UI state with provided values.
+
+        Only values that actually changed mark the layout dirty and wake the
+        render loop.
+        """
+        changed = False
         for key, value in kwargs.items():
-            if hasattr(self, key):
-                setattr(self, key, value)
+            if key not in self._ALLOWED:
+                continue
+            current = getattr(self, key)
+            if key in self._LEVEL_KEYS:
+                if abs(value - current) <= self._LEVEL_EPSILON:
+                    continue
+            elif value == current:
+                continue
+            setattr(self, key, value)
+            changed = True
+
+        if changed:
+            self._dirty = True
+            self._updated.set()
+
+    def update_levels(
+        self, left_level: float, left_active: int, right_level: float, right_active: int
+    ) -> None:
+        """Update both microphones' levels and states.
+
+        Same as update_state() for these four fields, without the keyword
+        handling, as it is called for every audio chunk.
+        """
+        changed = False
+        if abs(left_level - self.left_level) > self._LEVEL_EPSILON:
+            self.left_level = left_level
+            changed = True
+        if abs(right_level - self.right_level) > self._LEVEL_EPSILON:
+            self.right_level = right_level
+            changed = True
+        if left_active != self.left_active:
+            self.left_active = left_active
+            changed = True
+        if right_active != self.right_active:
+            self.right_active = right_active
+            changed = True
+
+        if changed:
+            self._dirty = True
+            self._updated.set()
+
+    def wake(self) -> None:
+        """Wake the render loop without a state change, e.g. to stop it."""
+        self._updated.set()
+
+    def wait_for_update(self, timeout: Optional[float] = None) -> bool:
+        """Block until the state is updated or timeout expires."""
+        if not self._updated.wait(timeout):
+            return False
+        self._updated.clear()
+        return True
+
+    def _message_age(self) -> int:
+        """Return the age of the last message in whole seconds."""
+        if not self.last_message:
+            return 0
+        return int(time.monotonic() - self.last_message_time)
+
+    def needs_render(self) -> bool:
+        """Return True if the layout is out of date with the current state."""
+        return self._dirty or self._message_age() != self._rendered_age
 
     def print_input_devices(self, devices: list) -> None:
         """Print all available input devices to the console."""
@@ -69,111 +214,147 @@ class MonitorUI:
 
         self.console.print(table)
 
-    def generate_layout(self) -> Layout:
-        """Generate the TUI layout."""
-        layout = Layout()
+    def _build_mic_panel(self, title: str) -> tuple:
+        """Build a microphone panel and return it with its updatable cells."""
+        # Name, state and level lines share one Text, the bar goes below it
+        text = Text()
+        progress = ProgressBar(total=1, completed=0)
+
+        return Panel(Group(text, progress), title=title), (text, progress)
+
+    def _build_layout(self) -> None:
+        """Build the layout tree once, frames only update its variable cells."""
+        self._layout = Layout()
 
         # Split into header, body, and footer
-        layout.split(
+        self._layout.split(
             Layout(name="header", size=3),
             Layout(name="body"),
             Layout(name="footer", size=3),
         )
 
         # Split body into left and right columns
-        layout["body"].split_row(Layout(name="left_mic"), Layout(name="right_mic"))
+        self._layout["body"].split_row(
+            Layout(name="left_mic"), Layout(name="right_mic")
+        )
+
+        # The broker address does not change while the monitor runs
+        mqtt_config = self.config["mqtt"]
+        self._broker_label = (
+            f" | MQTT Broker: {mqtt_config['broker']}:{mqtt_config['port']}"
+        )
 
-        # Create header content
-        header_text = Text()
-        header_text.append("Dual Microphone MQTT Monitor", style="bold white")
-        header_text.append(
-            f" | MQTT Broker: {self.config['mqtt']['broker']}:{self.config['mqtt']['port']}"
+        self._header_text = Text()
+        self._header_panel = Panel(self._header_text)
+        self._layout["header"].update(self._header_panel)
+
+        left_panel, self._left_cells = self._build_mic_panel("Left Microphone")
+        right_panel, self._right_cells = self._build_mic_panel("Right Microphone")
+        self._layout["left_mic"].update(left_panel)
+        self._layout["right_mic"].update(right_panel)
+
+        self._footer_text = Text()
+        self._footer_panel = Panel(self._footer_text, title="Status")
+        self._layout["footer"].update(self._footer_panel)
+
+    @classmethod
+    def _update_mic_cells(
+        cls,
+        cells: tuple,
+        name_line: str,
+        level: float,
+        active: int,
+        threshold: float,
+        max_level: float,
+    ) -> None:
+        """Refresh the variable cells of a microphone panel in place."""
+        text, progress = cells
+
+        text.plain = name_line
+        text.append(
+            f"State: {'ACTIVE' if active else 'INACTIVE'}",
+            style=cls._STYLE_GREEN if active else cls._STYLE_BLUE,
         )
+        text.append(f"\nLevel: {level:.2f}")
+
+        progress.update(min(level, max_level), total=max_level)
+        progress.style = cls._STYLE_GREEN if level > threshold else cls._STYLE_BLUE
+
+    def generate_layout(self) -> Layout:
+        """Update the TUI layout with the current state and return it."""
+        if not self.needs_render():
+            return self._layout
+
+        # Cleared first, so updates arriving while rendering mark it dirty again
+        self._dirty = False
+
+        # Refill the header text in place, clearing it also drops its styles
+        header_text = self._header_text
+        header_text.plain = ""
+        header_text.append("Dual Microphone MQTT Monitor", style=self._STYLE_TITLE)
+        header_text.append(self._broker_label)
 
         # Determine connection status and appropriate styling
         if self.mqtt_reconnecting:
             status = f"RECONNECTING (Attempt {self.reconnect_attempts})"
-            status_style = "yellow"
+            status_style = self._STYLE_YELLOW
         else:
             status = "CONNECTED" if self.mqtt_connected else "DISCONNECTED"
-            status_style = "green" if self.mqtt_connected else "red"
+            status_style = self._STYLE_GREEN if self.mqtt_connected else self._STYLE_RED
 
         # Determine header color based on connection status
         if self.mqtt_connected:
-            header_style = "white on blue"
+            header_style = self._STYLE_HEADER_CONNECTED
         elif self.mqtt_reconnecting:
-            header_style = "white on yellow"
+            header_style = self._STYLE_HEADER_RECONNECTING
         else:
-            header_style = "white on red"
+            header_style = self._STYLE_HEADER_DISCONNECTED
 
-        header_text.append(f" | Status: ", style="white")
+        header_text.append(" | Status: ", style=self._STYLE_WHITE)
         header_text.append(status, style=status_style)
         header_text.append(f" | Messages Sent: {self.mqtt_messages_sent}")
 
         # Use dynamic header style for the panel
-        layout["header"].update(Panel(header_text, style=header_style))
+        self._header_panel.style = header_style
 
-        # Create mic panels
+        # Update mic panels
         threshold = self.config["audio"]["threshold"]
         max_level = threshold * 4  # For visualization scaling
 
-        # Left mic panel
-        left_panel = Table.grid(expand=True)
-        left_panel.add_column()
-        left_panel.add_row(f"LEFT MICROPHONE: {self.left_device_name}")
-
-        left_state_text = "ACTIVE" if self.left_active else "INACTIVE"
-        left_state_style = "green" if self.left_active else "blue"
-        left_panel.add_row(Text(f"State: {left_state_text}", style=left_state_style))
-        left_panel.add_row(f"Level: {self.left_level:.2f}")
-
-        # Progress bar for left mic
-        left_bar_style = "green" if self.left_level > threshold else "blue"
-        left_progress = ProgressBar(
-            total=max_level,
-            completed=min(self.left_level, max_level),
-            style=left_bar_style,
+        self._update_mic_cells(
+            self._left_cells,
+            self._left_name_line,
+            self.left_level,
+            self.left_active,
+            threshold,
+            max_level,
         )
-        left_panel.add_row(left_progress)
-
-        # Right mic panel
-        right_panel = Table.grid(expand=True)
-        right_panel.add_column()
-        right_panel.add_row(f"RIGHT MICROPHONE: {self.right_device_name}")
-
-        right_state_text = "ACTIVE" if self.right_active else "INACTIVE"
-        right_state_style = "green" if self.right_active else "blue"
-        right_panel.add_row(Text(f"State: {right_state_text}", style=right_state_style))
-        right_panel.add_row(f"Level: {self.right_level:.2f}")
-
-        # Progress bar for right mic
-        right_bar_style = "green" if self.right_level > threshold else "blue"
-        right_progress = ProgressBar(
-            total=max_level,
-            completed=min(self.right_level, max_level),
-            style=right_bar_style,
+        self._update_mic_cells(
+            self._right_cells,
+            self._right_name_line,
+            self.right_level,
+            self.right_active,
+            threshold,
+            max_level,
         )
-        right_panel.add_row(right_progress)
-
-        layout["left_mic"].update(Panel(left_panel, title="Left Microphone"))
-        layout["right_mic"].update(Panel(right_panel, title="Right Microphone"))
 
-        # Create footer with last message and help text
-        footer_text = Text()
+        # Refill the footer with last message and help text
+        footer_text = self._footer_text
+        footer_text.plain = ""
+        self._rendered_age = self._message_age()
         if self.last_message:
-            time_diff = time.time() - self.last_message_time
             footer_text.append(
-                f"Last Message ({time_diff:.1f}s ago): {self.last_message}"
+                f"Last Message ({self._rendered_age}s ago): {self.last_message}"
             )
         else:
             footer_text.append("No messages sent yet")
 
         if self.error_message:
-            footer_text.append(f"\nSTATUS: {self.error_message}", style="bold red")
-
-        layout["footer"].update(Panel(footer_text, title="Status"))
+            footer_text.append(
+                f"\nSTATUS: {self.error_message}", style=self._STYLE_ERROR
+            )
 
-        return layout
+        return self._layout
 
     def print_error(self, message: str) -> None:
         """Print an error message."""